@@ -2,34 +2,93 @@
 
 import streamlit as st
 import pandas as pd
-from database_manager import DatabaseManager
-from auth_manager import AuthManager
+from database_manager import DatabaseManager, get_db_manager, get_data_version, bump_data_version
+from auth_manager import get_auth_manager
+from display_utils import display_dataframe_quickly
+import disk_cache
 from typing import List, Dict, Any
 
+# Possible organization categories (used for the dropdowns)
+# This should match your data structure, modify as needed
+ORG_CATEGORIES: tuple[str, ...] = (
+    "Academic",
+    "Athletics",
+    "Arts & Culture",
+    "Community Service",
+    "STEM",
+    "Student Government",
+    "Other",
+)
+
+# Possible user roles (used for the role dropdown)
+POSSIBLE_ROLES: tuple[str, ...] = ('student', 'club_leader', 'faculty', 'teacher', 'admin')
+
+# Option -> position maps for the selectbox defaults (unknown values fall back to 0)
+CATEGORY_INDEX: Dict[str, int] = {category: i for i, category in enumerate(ORG_CATEGORIES)}
+ROLE_INDEX: Dict[str, int] = {role: i for i, role in enumerate(POSSIBLE_ROLES)}
+
+# Columns accepted by the bulk CSV import
+ORG_IMPORT_REQUIRED_COLUMNS = ('name', 'description', 'advisor_name')
+ORG_IMPORT_OPTIONAL_COLUMNS = ('category', 'meeting_info', 'logo_url', 'is_verified')
+
+# Columns shown in the admin tables (and their display labels); tables are built from these only
+ORG_DISPLAY_COLUMNS = {'id': 'Org ID', 'name': 'Name', 'category': 'Category',
+                       'advisor_name': 'Advisor', 'is_verified': 'Verified',
+                       'created_at': 'Created At'}
+USER_DISPLAY_COLUMNS = {'id': 'User ID', 'full_name': 'Full Name', 'email': 'Email',
+                        'role': 'Current Role', 'grad_year': 'Grad Year'}
+
+# --- Data Fetching and Caching ---
+# The leading underscore on _db tells Streamlit not to hash the DatabaseManager.
+# The version argument is only a cache key: mutations below bump it so just that
+# resource re-fetches, instead of clearing every cached function in the app.
+
+@st.cache_data(ttl=60)
+def _cached_org_directory(_db: DatabaseManager, version: int, name_contains: str = "",
+                          categories: tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """
+    Fetches organizations for the admin panel, cached between reruns.
+    The filters run in the database and are part of the cache key.
+    """
+    return _db.get_org_directory(categories=list(categories), name_contains=name_contains)
+
+@st.cache_data(ttl=60)
+def _cached_all_users(_db: DatabaseManager, version: int) -> List[Dict[str, Any]]:
+    """Fetches all user profiles for the admin panel, cached between reruns."""
+    return _db.get_all_users_with_profiles(columns=list(USER_DISPLAY_COLUMNS))
+
+def _build_display_table(rows: List[Dict[str, Any]], display_columns: Dict[str, str]) -> pd.DataFrame:
+    """Projects rows onto display_columns and renames them to their display labels."""
+    return pd.DataFrame.from_records(rows, columns=list(display_columns)).rename(columns=display_columns)
+
+# The display tables are cached on the same version keys, so the projection and
+# DataFrame construction st.dataframe would otherwise do each rerun happen once per change.
+
+@st.cache_data(ttl=60)
+def _cached_orgs_table(_db: DatabaseManager, version: int, name_contains: str = "",
+                       categories: tuple[str, ...] = ()) -> pd.DataFrame:
+    """Builds the organization table shown in the admin panel."""
+    return _build_display_table(_cached_org_directory(_db, version, name_contains, categories),
+                                ORG_DISPLAY_COLUMNS)
+
+@st.cache_data(ttl=60)
+def _cached_users_table(_db: DatabaseManager, version: int) -> pd.DataFrame:
+    """Builds the user table shown in the admin panel."""
+    return _build_display_table(_cached_all_users(_db, version), USER_DISPLAY_COLUMNS)
+
+@st.fragment
 def add_organization_form(db_manager: DatabaseManager):
     """
     Displays the form for adding a new organization and handles submission.
     """
     st.subheader("➕ Add New Organization")
-    
-    # 1. Define possible categories (used for the dropdown)
-    # This should match your data structure, modify as needed
-    org_categories = [
-        "Academic",
-        "Athletics",
-        "Arts & Culture",
-        "Community Service",
-        "STEM",
-        "Student Government",
-        "Other"
-    ]
-
-    with st.form("add_organization_form", clear_on_submit=True):
+
+    with st.form("add_organization_form", clear_on_submit=True, enter_to_submit=False):
         
         # --- Form Fields ---
         name = st.text_input("Organization Name *", max_chars=100)
         description = st.text_area("Description * (What is the mission?)")
-        category = st.selectbox("Category *", options=org_categories)
+        category = st.selectbox("Category *", options=ORG_CATEGORIES)
         advisor_name = st.text_input("Faculty Advisor Name *")
         meeting_info = st.text_input("Meeting Info (e.g., Tuesdays at 3:30 PM, Room 101)")
         logo_url = st.text_input("Logo URL (Optional)", help="A direct link to the club's logo or image.")
@@ -38,12 +97,12 @@ def add_organization_form(db_manager: DatabaseManager):
         add_submitted = st.form_submit_button("Create Organization")
 
         if add_submitted:
-            # 2. Validation
+            # 1. Validation
             if not (name and description and advisor_name):
                 st.error("Please fill in all required fields marked with *.")
                 return
             
-            # 3. Prepare Data
+            # 2. Prepare Data
             org_data = {
                 "name": name,
                 "description": description,
@@ -54,13 +113,13 @@ def add_organization_form(db_manager: DatabaseManager):
                 "is_verified": is_verified
             }
             
-            # 4. Database Insertion
+            # 3. Database Insertion
             result = db_manager.add_organization(org_data)
             
             if result:
-                st.success(f"✅ Organization '{name}' created successfully!")
-                st.cache_data.clear() # Clear cache to refresh directory
-                # We don't need to rerun here, the success message is sufficient
+                st.toast(f"✅ Organization '{name}' created successfully!") # Toasts survive the rerun below
+                bump_data_version("orgs") # Refresh cached organization lists
+                st.rerun(scope="app") # Full rerun so the View/Edit tab shows the new organization
             else:
                 st.error(f"❌ Failed to create organization. It might already exist.")
                 st.warning("Check the terminal for database errors if this persists.")
@@ -68,57 +127,134 @@ def add_organization_form(db_manager: DatabaseManager):
 # End of new function add_organization_form
 
 
+@st.fragment
+def bulk_add_organizations_form(db_manager: DatabaseManager):
+    """
+    Imports many organizations from an uploaded CSV file in a single batched insert.
+    """
+    st.subheader("📄 Bulk Add from CSV")
+    st.caption(f"Required columns: {', '.join(ORG_IMPORT_REQUIRED_COLUMNS)}. "
+               f"Optional: {', '.join(ORG_IMPORT_OPTIONAL_COLUMNS)}.")
+
+    # The uploader's key includes a counter that is bumped after an import, which gives a fresh, empty
+    # uploader (a file_uploader's value can't be cleared through session_state)
+    uploader_version = st.session_state.get("bulk_org_csv_version", 0)
+    uploaded_file = st.file_uploader("Upload Organizations CSV", type="csv",
+                                     key=f"bulk_org_csv_{uploader_version}")
+
+    if uploaded_file is None:
+        return
+
+    try:
+        import_df = pd.read_csv(uploaded_file)
+    except Exception as e:
+        st.error(f"Could not read the CSV file: {e}")
+        return
+
+    missing_columns = [column for column in ORG_IMPORT_REQUIRED_COLUMNS if column not in import_df.columns]
+    if missing_columns:
+        st.error(f"The CSV is missing required columns: {', '.join(missing_columns)}")
+        return
+
+    # Keep only known columns and turn empty cells (NaN) into None for the database
+    known_columns = [column for column in ORG_IMPORT_REQUIRED_COLUMNS + ORG_IMPORT_OPTIONAL_COLUMNS
+                     if column in import_df.columns]
+    import_df = import_df[known_columns].astype(object).where(import_df[known_columns].notna(), None)
+
+    # Every row is sent with the same keys so they can go in one multi-row INSERT
+    org_rows = []
+    for row in import_df.to_dict(orient="records"):
+        if not all(row.get(column) for column in ORG_IMPORT_REQUIRED_COLUMNS):
+            continue
+        org_rows.append({
+            "name": str(row['name']),
+            "description": str(row['description']),
+            "category": row.get('category') if row.get('category') in ORG_CATEGORIES else "Other",
+            "advisor_name": str(row['advisor_name']),
+            "meeting_info": row.get('meeting_info'),
+            "logo_url": row.get('logo_url'),
+            "is_verified": str(row.get('is_verified')).strip().lower() in ('true', 'yes', '1')
+        })
+
+    skipped_count = len(import_df) - len(org_rows)
+    if skipped_count:
+        st.warning(f"{skipped_count} row(s) are missing required fields and will be skipped.")
+
+    if not org_rows:
+        st.error("No valid organizations found in the CSV.")
+        return
+
+    st.dataframe(org_rows, hide_index=True, use_container_width=True) # Preview what will be inserted
+
+    if st.button(f"Import {len(org_rows)} Organizations", type="primary", key="bulk_org_import_btn"):
+        inserted_orgs = db_manager.add_organizations(org_rows)
+
+        if inserted_orgs:
+            st.toast(f"✅ Imported {len(inserted_orgs)} organizations successfully!") # Toasts survive the rerun below
+            bump_data_version("orgs") # Refresh cached organization lists
+            st.session_state.bulk_org_csv_version = uploader_version + 1 # Clear the uploaded file
+            st.rerun(scope="app") # Full rerun so the View/Edit tab shows the new organizations
+        else:
+            st.error("❌ Failed to import organizations. Some names might already exist.")
+            st.warning("Check the terminal for database errors if this persists.")
+
+# End of bulk_add_organizations_form
+
+
+@st.fragment
 def view_edit_organizations_section(db_manager: DatabaseManager):
     """
     Displays all organizations, allows selection for editing, and handles updates/deletions.
     """
     st.subheader("🔎 View and Edit Organizations")
 
-    all_orgs = db_manager.get_org_directory()
+    # Filters are passed to the database query (and the cache key), not applied in pandas
+    col_search, col_categories = st.columns([2, 3])
+    name_contains = col_search.text_input("Search by Name", key="admin_org_search").strip()
+    categories = tuple(col_categories.multiselect("Categories", options=ORG_CATEGORIES, key="admin_org_categories"))
+
+    orgs_version = get_data_version("orgs")
+    all_orgs = _cached_org_directory(db_manager, orgs_version, name_contains, categories)
 
     if not all_orgs:
-        st.warning("No organizations found yet. Use the '➕ Add New' tab to create one.")
+        if name_contains or categories:
+            st.info("No organizations match your search and category filters.")
+        else:
+            st.warning("No organizations found yet. Use the '➕ Add New' tab to create one.")
         return
 
-    orgs_df = pd.DataFrame(all_orgs)
-    display_columns = ['id', 'name', 'category', 'advisor_name', 'is_verified', 'created_at']
-    orgs_df = orgs_df[display_columns]
-    orgs_df.rename(columns={'id': 'Org ID', 'name': 'Name', 'category': 'Category', 
-                            'advisor_name': 'Advisor', 'is_verified': 'Verified', 
-                            'created_at': 'Created At'}, inplace=True)
-    
-    st.dataframe(orgs_df, hide_index=True, use_container_width=True)
+    # Lookup dict for the selectbox labels and the selected org's details (O(1) per access)
+    orgs_by_id = {org['id']: org for org in all_orgs}
+
+    orgs_table = _cached_orgs_table(db_manager, orgs_version, name_contains, categories)
+
+    display_dataframe_quickly(orgs_table, key="orgs_table_page",
+                              hide_index=True, use_container_width=True)
 
     st.markdown("---")
     st.write("### Select Organization to Edit or Delete")
     
     selected_org_id = st.selectbox(
         "Select Organization:",
-        options=orgs_df['Org ID'],
-        format_func=lambda org_id: f"{orgs_df[orgs_df['Org ID'] == org_id]['Name'].iloc[0]} (ID: {org_id})"
+        options=list(orgs_by_id),
+        format_func=lambda org_id: f"{orgs_by_id[org_id]['name']} (ID: {org_id})"
     )
 
-    selected_org_details = next((org for org in all_orgs if org['id'] == selected_org_id), None)
+    selected_org_details = orgs_by_id.get(selected_org_id)
 
     if selected_org_details:
         st.markdown(f"#### Editing '{selected_org_details['name']}'")
-        
-        org_categories = [
-            "Academic", "Athletics", "Arts & Culture", "Community Service", 
-            "STEM", "Student Government", "Other"
-        ]
 
-        # Initialize session state for delete confirmation if not present
-        if f'confirm_delete_{selected_org_id}' not in st.session_state:
-            st.session_state[f'confirm_delete_{selected_org_id}'] = False
+        # Only one organization can be pending delete confirmation at a time
+        st.session_state.setdefault('pending_delete_org_id', None)
 
-        with st.form(f"edit_organization_form_{selected_org_id}"): 
+        with st.form(f"edit_organization_form_{selected_org_id}", enter_to_submit=False):
             name = st.text_input("Organization Name *", max_chars=100, value=selected_org_details['name'])
             description = st.text_area("Description *", value=selected_org_details['description'])
             category = st.selectbox(
                 "Category *", 
-                options=org_categories, 
-                index=org_categories.index(selected_org_details['category']) if selected_org_details['category'] in org_categories else 0
+                options=ORG_CATEGORIES, 
+                index=CATEGORY_INDEX.get(selected_org_details['category'], 0)
             )
             advisor_name = st.text_input("Faculty Advisor Name *", value=selected_org_details['advisor_name'])
             meeting_info = st.text_input("Meeting Info", value=selected_org_details['meeting_info'])
@@ -134,7 +270,7 @@ def view_edit_organizations_section(db_manager: DatabaseManager):
             
             # --- Handle Update ---
             if update_submitted:
-                st.session_state[f'confirm_delete_{selected_org_id}'] = False # Hide confirmation if updating
+                st.session_state.pending_delete_org_id = None # Hide confirmation if updating
                 if not (name and description and advisor_name):
                     st.error("Please fill in all required fields marked with *.")
                     return
@@ -153,7 +289,8 @@ def view_edit_organizations_section(db_manager: DatabaseManager):
                 
                 if result:
                     st.success(f"✅ Organization '{name}' updated successfully!")
-                    st.cache_data.clear()
+                    bump_data_version("orgs")
+                    disk_cache.invalidate("events") # Events show the host's name
                     st.rerun()
                 else:
                     st.error(f"❌ Failed to update organization '{name}'.")
@@ -161,12 +298,12 @@ def view_edit_organizations_section(db_manager: DatabaseManager):
             # --- Handle Delete Request ---
             if request_delete:
                 # Set session state to true to show the confirmation button outside the form
-                st.session_state[f'confirm_delete_{selected_org_id}'] = True
+                st.session_state.pending_delete_org_id = selected_org_id
                 st.rerun() # Rerun to display the confirmation outside the form
 
 
         # --- Delete Confirmation (OUTSIDE the form context) ---
-        if st.session_state[f'confirm_delete_{selected_org_id}']:
+        if st.session_state.pending_delete_org_id == selected_org_id:
             st.warning(f"Are you sure you want to delete '{selected_org_details['name']}'? This action cannot be undone.", icon="⚠️")
             
             # Now, this is a regular st.button and is NOT inside the form
@@ -176,66 +313,42 @@ def view_edit_organizations_section(db_manager: DatabaseManager):
                     result = db_manager.delete_organization(selected_org_id)
                     if result:
                         st.success(f"🗑️ Organization '{selected_org_details['name']}' deleted successfully!")
-                        st.session_state[f'confirm_delete_{selected_org_id}'] = False # Reset confirmation state
-                        st.cache_data.clear() 
+                        st.session_state.pending_delete_org_id = None # Reset confirmation state
+                        bump_data_version("orgs")
+                        disk_cache.invalidate("events")
                         st.rerun() 
                     else:
                         st.error(f"❌ Failed to delete organization '{selected_org_details['name']}'.")
             with col_cancel_del:
                 if st.button("Cancel Delete", key=f"cancel_delete_{selected_org_id}", type="secondary"):
-                    st.session_state[f'confirm_delete_{selected_org_id}'] = False # Hide confirmation
+                    st.session_state.pending_delete_org_id = None # Hide confirmation
                     st.rerun()
 
 # End of view_edit_organizations_section
 
 
-def show_admin_panel_page():
+@st.fragment
+def user_management_section(db_manager: DatabaseManager, current_user_id: str):
     """
-    Displays the Admin Panel, allowing admin users to manage users and organizations.
+    Displays all users and handles role changes. Runs as a fragment so
+    interacting with the role form only reruns this section.
     """
-    st.title("⚙️ Admin Panel")
-    st.markdown("---")
-
-    auth = AuthManager()
-    db_manager = DatabaseManager()
-
-    current_user_id = auth.get_current_user().get('id')
-    current_user_role = auth.get_user_role()
-
-    # --- Authorization Check ---
-    if current_user_role != 'admin': # Only 'admin' role can access the full panel
-        st.error("Access Denied: You must be an administrator to view this page.")
-        if st.button("Go to Home"):
-            st.session_state.current_page = "home"
-            st.rerun()
-        return
-
-    st.success(f"Welcome, Admin ({auth.get_current_user().get('full_name')})! Manage your school hub below.")
-    st.markdown("---")
-
-    # ====================================================================
-    # 1. User Management Section
-    # ====================================================================
-    st.subheader("👨‍💻 User Management")
-    st.info("View and change user roles. Changing a user's role will affect their permissions.")
-
-    all_users: List[Dict[str, Any]] = db_manager.get_all_users_with_profiles()
+    all_users: List[Dict[str, Any]] = _cached_all_users(db_manager, get_data_version("users"))
 
     if not all_users:
         st.warning("No users found in the system.")
         return
 
-    # Create a DataFrame for display and easy manipulation
-    users_df = pd.DataFrame(all_users)
-    users_df = users_df[['id', 'full_name', 'email', 'role', 'grad_year']] # Select and order columns
-    users_df.rename(columns={'id': 'User ID', 'full_name': 'Full Name', 'email': 'Email', 
-                             'role': 'Current Role', 'grad_year': 'Grad Year'}, inplace=True)
-    
-    # Define possible roles for the dropdown
-    possible_roles = ['student', 'club_leader', 'faculty', 'teacher', 'admin']
+    # Lookup dict for the selectbox options, labels and current-role default
+    users_by_id = {user['id']: user for user in all_users}
 
-    with st.form("user_role_form"):
-        st.dataframe(users_df, hide_index=True, use_container_width=True) # Display all users
+    users_table = _cached_users_table(db_manager, get_data_version("users"))
+
+    # Display all users (outside the form so the paging slider reruns immediately)
+    display_dataframe_quickly(users_table, key="users_table_page",
+                              hide_index=True, use_container_width=True)
+
+    with st.form("user_role_form", enter_to_submit=False):
 
         st.markdown("---")
         st.write("### Change User Role")
@@ -243,15 +356,15 @@ def show_admin_panel_page():
         # Dropdown to select user
         user_to_change_id = st.selectbox(
             "Select User to Update Role:",
-            options=users_df['User ID'],
-            format_func=lambda user_id: f"{users_df[users_df['User ID'] == user_id]['Full Name'].iloc[0]} ({users_df[users_df['User ID'] == user_id]['Email'].iloc[0]})"
+            options=list(users_by_id),
+            format_func=lambda user_id: f"{users_by_id[user_id]['full_name']} ({users_by_id[user_id]['email']})"
         )
         
         # Dropdown to select new role
         new_role = st.selectbox(
             "Select New Role:",
-            options=possible_roles,
-            index=possible_roles.index(users_df[users_df['User ID'] == user_to_change_id]['Current Role'].iloc[0]) # Default to current role
+            options=POSSIBLE_ROLES,
+            index=ROLE_INDEX.get(users_by_id[user_to_change_id]['role'], 0) # Default to current role
         )
 
         update_role_submitted = st.form_submit_button("Update Role")
@@ -261,12 +374,49 @@ def show_admin_panel_page():
                 st.error("Admin cannot demote themselves from 'admin' role through this panel.")
             else:
                 if db_manager.update_user_role(user_to_change_id, new_role):
-                    st.success(f"Role for {users_df[users_df['User ID'] == user_to_change_id]['Full Name'].iloc[0]} updated to '{new_role}'.")
-                    st.cache_data.clear() # Clear cache to refresh UI
+                    st.success(f"Role for {users_by_id[user_to_change_id]['full_name']} updated to '{new_role}'.")
+                    bump_data_version("users") # Refresh cached user list
                     st.rerun()
                 else:
                     st.error("Failed to update user role. Please try again.")
-    
+
+# End of user_management_section
+
+
+def show_admin_panel_page():
+    """
+    Displays the Admin Panel, allowing admin users to manage users and organizations.
+    """
+    st.title("⚙️ Admin Panel")
+    st.markdown("---")
+
+    auth = get_auth_manager()
+    db_manager = get_db_manager()
+
+    # Read the user straight from session state (set at login), falling back to AuthManager
+    current_user = st.session_state.get('user') or auth.get_current_user() or {}
+    current_user_id = current_user.get('id')
+    current_user_role = st.session_state.get('user_role') or auth.get_user_role()
+
+    # --- Authorization Check ---
+    if current_user_role != 'admin': # Only 'admin' role can access the full panel
+        st.error("Access Denied: You must be an administrator to view this page.")
+        if st.button("Go to Home"):
+            st.session_state.current_page = "home"
+            st.rerun()
+        return
+
+    st.success(f"Welcome, Admin ({current_user.get('full_name')})! Manage your school hub below.")
+    st.markdown("---")
+
+    # ====================================================================
+    # 1. User Management Section
+    # ====================================================================
+    st.subheader("👨‍💻 User Management")
+    st.info("View and change user roles. Changing a user's role will affect their permissions.")
+
+    user_management_section(db_manager, current_user_id)
+
     st.markdown("---")
 
 
@@ -285,6 +435,8 @@ def show_admin_panel_page():
     
     with add_tab:
         add_organization_form(db_manager)
+        st.markdown("---")
+        bulk_add_organizations_form(db_manager)
 
     with view_tab:
         # st.warning("The ability to view, edit, and delete existing organizations is scheduled for the next mini-sprint.") # <-- COMMENT OUT OR DELETE THIS LINE
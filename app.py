@@ -1,16 +1,19 @@
 # app.py (Updated for Auth)
 
 import streamlit as st
-import directory_page 
-import detail_page 
-import calendar_page 
+import importlib
 import auth_manager
 from datetime import datetime
-import profile_page
-import admin_panel_page
+
+def _load_page(module_name: str):
+    """
+    Imports a page module on demand, so only the page being viewed (and its
+    pandas/database dependencies) is loaded. Later calls hit Python's module cache.
+    """
+    return importlib.import_module(module_name)
 
 # --- Initialize AuthManager ---
-auth = auth_manager.AuthManager()
+auth = auth_manager.get_auth_manager()
 
 # --- Basic App Configuration ---
 st.set_page_config(
@@ -27,6 +30,11 @@ st.sidebar.markdown("---")
 if auth.is_logged_in():
     user_role = auth.get_user_role() # Get user role here
     st.sidebar.write(f"Welcome, {auth.get_current_user().get('full_name', 'User')}!")
+    if auth.is_profile_loading():
+        # Profile still arriving after login: rerun once it lands so role-based options appear
+        st.sidebar.caption("Loading your profile…")
+        with st.sidebar:
+            auth_manager.wait_for_profile(auth)
     if st.sidebar.button("Home"):
         st.session_state.current_page = "home"
     if st.sidebar.button("Clubs Directory"):
@@ -66,6 +74,8 @@ else: # Not logged in
         if login_submitted:
             if auth.sign_in(email, password):
                 st.success("Logged in successfully!")
+                # Start loading calendar events in the background now that the calendar is reachable
+                _load_page("calendar_prefetch").prefetch_calendar_events()
                 st.session_state.current_page = "home" # Redirect after successful login
                 st.rerun()
             else:
@@ -91,13 +101,13 @@ if st.session_state.current_page == "home":
         st.markdown("Use the navigation on the left to find clubs, view the calendar, or manage your profile.")
     
 elif st.session_state.current_page == "directory":
-    directory_page.show_directory() 
+    _load_page("directory_page").show_directory()
     
 elif st.session_state.current_page == "detail":
-    detail_page.show_group_detail()
+    _load_page("detail_page").show_group_detail()
     
 elif st.session_state.current_page == "calendar":
-    calendar_page.show_calendar()
+    _load_page("calendar_page").show_calendar()
 
 elif st.session_state.current_page == "signup":
     st.title("Sign Up for the Dohmens Community Hub")
@@ -126,10 +136,10 @@ elif st.session_state.current_page == "signup":
                     st.error(st.session_state['auth_error'])
 
 elif st.session_state.current_page == "profile":
-    profile_page.show_profile_page()
+    _load_page("profile_page").show_profile_page()
 
 elif st.session_state.current_page == "admin_panel": # <-- NEW ROUTE
-    admin_panel_page.show_admin_panel_page()
+    _load_page("admin_panel_page").show_admin_panel_page()
 
 else:
     st.error("Page not found.")
@@ -1,16 +1,20 @@
 # auth_manager.py
 
 import streamlit as st
-import os
+import threading
+import logging
 from supabase import create_client, Client
-from dotenv import load_dotenv
 from typing import Optional, Dict, Any
+from config import SUPABASE_URL, SUPABASE_KEY
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# --- Supabase Configuration ---
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+# How long sign_in waits for the background profile fetch before letting the page render
+PROFILE_WAIT_SECONDS = 2.0
+# How often a page still waiting on the profile checks whether it has arrived
+PROFILE_POLL_SECONDS = 1.0
+# Fetch attempts (the first plus retries) before giving up on a failing profile request
+PROFILE_FETCH_ATTEMPTS = 3
 
 class AuthManager:
     """
@@ -22,13 +26,25 @@ class AuthManager:
             st.error("Supabase URL and Key must be set in .env file.")
             st.stop()
             
+        # Not the shared config.get_client(): sign-in stores this user's session on the client
         self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+        # Profile fetched in the background after sign_in; merged into session state on the next read.
+        # None means nothing pending, {} means the fetch found no profile. A request error sets
+        # _profile_fetch_failed instead, so the user stays logged in and the fetch is retried.
+        self._pending_profile: Optional[Dict[str, Any]] = None
+        self._profile_fetch_failed = False
+        self._profile_thread: Optional[threading.Thread] = None
+        self._profile_attempts = 0
+        self._profile_lock = threading.Lock()
         
         # Initialize session state for user and authentication
         if 'user' not in st.session_state:
             st.session_state['user'] = None
         if 'logged_in' not in st.session_state:
             st.session_state['logged_in'] = False
+        if 'user_role' not in st.session_state:
+            st.session_state['user_role'] = None
         if 'auth_error' not in st.session_state:
             st.session_state['auth_error'] = None
 
@@ -56,9 +72,7 @@ class AuthManager:
                 profile_response = self.supabase.table("users").insert(user_data).execute()
 
                 if profile_response.data:
-                    st.session_state['user'] = profile_response.data[0]
-                    st.session_state['logged_in'] = True
-                    st.session_state['auth_error'] = None
+                    self._set_session_user(profile_response.data[0])
                     return True
                 else:
                     # If profile insert fails, consider deleting the auth user if possible (complex)
@@ -72,29 +86,22 @@ class AuthManager:
             return False
 
     def sign_in(self, email, password):
-        """Logs in an existing user and retrieves their profile."""
+        """
+        Logs in an existing user. The full profile is fetched in a background thread and
+        waited on for up to PROFILE_WAIT_SECONDS; if it is slower the page renders with only
+        id and email, and wait_for_profile reruns the app once it arrives.
+        """
         try:
             auth_response = self.supabase.auth.sign_in_with_password(
                 {"email": email, "password": password}
             )
 
             if auth_response.user:
-                # Fetch the full user profile from our 'users' table
-                # We expect the 'id' in 'users' to match auth_response.user.id
-                profile_response = (self.supabase.table("users")
-                                    .select("*")
-                                    .eq("id", auth_response.user.id)
-                                    .single()
-                                    .execute())
-                
-                if profile_response.data:
-                    st.session_state['user'] = profile_response.data
-                    st.session_state['logged_in'] = True
-                    st.session_state['auth_error'] = None
-                    return True
-                else:
-                    st.session_state['auth_error'] = "User profile not found after login."
-                    return False
+                self._set_session_user({"id": auth_response.user.id, "email": email})
+                self._profile_attempts = 0
+                self._start_profile_fetch(auth_response.user.id)
+                self._profile_thread.join(PROFILE_WAIT_SECONDS) # Usually done well within this
+                return True
             else:
                 st.session_state['auth_error'] = auth_response.json().get('error_description', 'Unknown sign-in error')
                 return False
@@ -106,23 +113,115 @@ class AuthManager:
         """Logs out the current user."""
         try:
             self.supabase.auth.sign_out()
-            st.session_state['user'] = None
-            st.session_state['logged_in'] = False
-            st.session_state['auth_error'] = None
+            self._set_session_user(None)
             return True
         except Exception as e:
             st.session_state['auth_error'] = f"Logout failed: {e}"
             return False
 
+    def _start_profile_fetch(self, user_id: str):
+        """Starts _hydrate_profile for user_id in a background thread."""
+        self._profile_attempts += 1
+        self._profile_thread = threading.Thread(target=self._hydrate_profile, args=(user_id,), daemon=True)
+        self._profile_thread.start()
+
+    def _hydrate_profile(self, user_id: str):
+        """
+        Runs in a background thread: fetches the user's row from our 'users' table
+        (its 'id' matches the auth user id) and parks it for the next rerun.
+        Must not touch st.session_state, which is only safe on the script thread.
+        """
+        try:
+            rows = (self.supabase.table("users")
+                    .select("*")
+                    .eq("id", user_id)
+                    .limit(1)
+                    .execute()).data
+        except Exception:
+            logger.exception(f"Error fetching profile for user {user_id}")
+            with self._profile_lock:
+                self._profile_fetch_failed = True
+            return
+        with self._profile_lock:
+            self._pending_profile = rows[0] if rows else {}
+
+    def _apply_hydrated_profile(self):
+        """
+        Moves a profile fetched by _hydrate_profile into session state, if one is waiting.
+        After a failed fetch the user stays logged in and the fetch is retried.
+        """
+        with self._profile_lock:
+            profile, self._pending_profile = self._pending_profile, None
+            fetch_failed, self._profile_fetch_failed = self._profile_fetch_failed, False
+
+        user = st.session_state['user']
+        if fetch_failed:
+            if user and self._profile_attempts < PROFILE_FETCH_ATTEMPTS:
+                self._start_profile_fetch(user['id'])
+            return
+        if profile is None:
+            return
+
+        if not user or (profile and profile.get('id') != user.get('id')):
+            return # Logged out (or a different user logged in) while the fetch was running
+        if profile:
+            self._set_session_user(profile)
+        else:
+            self._set_session_user(None)
+            st.session_state['auth_error'] = "User profile not found after login."
+
+    def _set_session_user(self, user: Optional[Dict[str, Any]]):
+        """
+        Stores the logged-in user's profile (or None on logout) in session state,
+        along with their role so pages can read it without going through AuthManager.
+        """
+        st.session_state['user'] = user
+        st.session_state['user_role'] = user.get('role') if user else None
+        st.session_state['logged_in'] = user is not None
+        st.session_state['auth_error'] = None
+
+    def is_profile_fetch_running(self) -> bool:
+        """True while a background profile fetch is in flight."""
+        return self._profile_thread is not None and self._profile_thread.is_alive()
+
+    def is_profile_loading(self) -> bool:
+        """True while a profile fetch started by sign_in is running or its result hasn't been applied yet."""
+        with self._profile_lock:
+            result_waiting = self._pending_profile is not None or self._profile_fetch_failed
+        return result_waiting or self.is_profile_fetch_running()
+
     def is_logged_in(self):
         """Checks if a user is currently logged in."""
+        self._apply_hydrated_profile()
         return st.session_state['logged_in']
 
     def get_current_user(self) -> Optional[Dict[str, Any]]:
         """Returns the current logged-in user's profile data."""
+        self._apply_hydrated_profile()
         return st.session_state['user']
 
     def get_user_role(self) -> Optional[str]:
         """Returns the role of the current logged-in user."""
-        user = self.get_current_user()
-        return user.get('role') if user else None
\ No newline at end of file
+        self._apply_hydrated_profile()
+        return st.session_state['user_role']
+
+
+def get_auth_manager() -> AuthManager:
+    """
+    Returns this browser session's AuthManager, creating it on first use.
+    It is kept in st.session_state rather than st.cache_resource because its
+    Supabase client carries the signed-in user's auth session.
+    """
+    if 'auth_manager' not in st.session_state:
+        st.session_state['auth_manager'] = AuthManager()
+    return st.session_state['auth_manager']
+
+@st.fragment(run_every=PROFILE_POLL_SECONDS)
+def wait_for_profile(auth: AuthManager):
+    """
+    Polls until the profile fetch started at sign-in finishes, then reruns the app so
+    role-based UI (admin button, event permissions, welcome name) picks it up.
+    Render it only while auth.is_profile_loading().
+    """
+    if not auth.is_profile_fetch_running():
+        st.rerun(scope="app")
@@ -2,18 +2,68 @@
 
 import streamlit as st
 import pandas as pd
-from database_manager import DatabaseManager
+from database_manager import get_data_version
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import event_form
-from auth_manager import AuthManager
+from auth_manager import get_auth_manager
+from calendar_prefetch import EVENTS_PAGE_SIZE, fetch_events_page, take_prefetched_first_page
 
 # --- Data Fetching ---
+
 @st.cache_data(show_spinner="Loading Master Calendar events...")
-def get_calendar_events():
-    """Fetches all public events from the database."""
-    db_manager = DatabaseManager()
-    return db_manager.get_all_events(include_private=False)
+def get_calendar_events_page(orgs_version: int, events_version: int,
+                             page: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Fetches one page of public events from the database, plus the total event
+    count on the first page (None when unknown).
+    orgs_version and events_version are cache keys so renamed or deleted hosts
+    and newly added events show up immediately.
+    """
+    if page == 0:
+        prefetched = take_prefetched_first_page(orgs_version, events_version)
+        if prefetched is not None:
+            return prefetched
+    return fetch_events_page(orgs_version, events_version, page)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def build_calendar_df(orgs_version: int, events_version: int,
+                      pages_loaded: int) -> Tuple[pd.DataFrame, Optional[int], bool]:
+    """
+    Loads the first pages_loaded pages of events and builds the finished display table.
+    Returns the DataFrame, the total number of events (None when unknown), and
+    whether the database has more events than were loaded.
+    """
+    # Fetch every page loaded so far in this session (each page is cached separately)
+    event_data, total_events = get_calendar_events_page(orgs_version, events_version, 0)
+    last_page = event_data
+    for page in range(1, pages_loaded):
+        last_page, _ = get_calendar_events_page(orgs_version, events_version, page)
+        event_data = event_data + last_page
+
+    # Only offer more rows when the database has them (or, with an unknown total, the last page was full)
+    has_more_events = (len(event_data) < total_events) if total_events is not None else (len(last_page) == EVENTS_PAGE_SIZE)
+
+    if not event_data:
+        return pd.DataFrame(), total_events, False
+
+    # Data Processing for Display
+    df = pd.DataFrame(event_data)
+    # Convert timestamps to local datetime objects and format them (vectorized, no per-row apply)
+    df['start_time'] = pd.to_datetime(df['start_time']).dt.strftime('%m/%d/%Y %I:%M %p')
+    end_time_text = pd.to_datetime(df['end_time'], errors='coerce').dt.strftime('%I:%M %p') # NaN when missing
+    df['end_time'] = end_time_text.fillna('TBD')
+    
+    # Combine start/end times for a single display column
+    df['Time'] = df['start_time'] + (" - " + end_time_text).fillna("")
+    
+    # Rename Org Name and Category for filtering; as 'category' dtype each repeated value is stored once
+    df = df.rename(columns={'organization_name': 'Organization', 'organization_category': 'Category'})
+    df = df.astype({'Organization': 'category', 'Category': 'category'})
+
+    # Drop the raw columns instead of shipping them to the browser hidden
+    df = df.drop(columns=['start_time', 'end_time', 'id', 'is_public'], errors='ignore')
+    return df, total_events, has_more_events
 
 # --- Page Rendering ---
 
@@ -21,8 +71,8 @@ def show_calendar():
     """Implements the Master Calendar Page wireframe."""
     st.title("🗓️ Dohmens Master Calendar")
     
-    # Initialize AuthManager to check user role
-    auth = AuthManager()
+    # This session's AuthManager, to check user role
+    auth = get_auth_manager()
 
     # 1. State for showing the form
     if 'show_event_form' not in st.session_state:
@@ -50,30 +100,18 @@ def show_calendar():
         # Optionally, display a disabled button or just hide it
         st.button("➕ Add New Event", disabled=True, help="You must be a Club Leader, Faculty, or Admin to add events.", key="disabled_add_event_btn")
         
-    # Fetch Data
-    event_data = get_calendar_events()
+    # Fetch Data and build the display table (cached, so reruns don't redo the pandas work)
+    if 'event_pages_loaded' not in st.session_state:
+        st.session_state.event_pages_loaded = 1
+
+    df, total_events, has_more_events = build_calendar_df(get_data_version("orgs"), get_data_version("events"),
+                                                          st.session_state.event_pages_loaded)
     
-    if not event_data:
+    if df.empty:
         st.info("There are no upcoming events scheduled at this time.")
         return
 
-    # 4. Data Processing for Display
-    df = pd.DataFrame(event_data)
-    # Convert timestamps to local datetime objects and format them
-    df['start_time'] = pd.to_datetime(df['start_time']).dt.strftime('%m/%d/%Y %I:%M %p')
-    df['end_time'] = df['end_time'].apply(
-        lambda x: pd.to_datetime(x).strftime('%I:%M %p') if pd.notnull(x) else 'TBD'
-    )
-    
-    # Combine start/end times for a single display column
-    df['Time'] = df['start_time'] + df['end_time'].apply(lambda x: f" - {x}" if x != 'TBD' else "")
-    
-    # Combine Org Name and Category for filtering
-    df['Organization'] = df['organization_name']
-    df['Category'] = df['organization_category']
-
-
-    # 5. Filter and Display Table
+    # 3. Filter and Display Table
     st.markdown("---")
     st.subheader("Upcoming Events")
     
@@ -87,9 +125,13 @@ def show_calendar():
             "Time": st.column_config.TextColumn("Date & Time"),
             "location": st.column_config.TextColumn("Location"),
             "Organization": st.column_config.TextColumn("Hosted By"),
-            "Category": st.column_config.TextColumn("Type"),
-            "start_time": None, "end_time": None, "organization_name": None, 
-            "organization_category": None, "id": None, "created_at": None,
-            "is_public": None, "description": None, "organization_id": None
+            "Category": st.column_config.TextColumn("Type")
         }
-    )
\ No newline at end of file
+    )
+
+    st.caption(f"Showing {len(df)} of {total_events} events" if total_events is not None
+               else f"Showing {len(df)} events")
+    if has_more_events:
+        if st.button("Load More Events"):
+            st.session_state.event_pages_loaded += 1
+            st.rerun()
\ No newline at end of file
@@ -0,0 +1,81 @@
+# calendar_prefetch.py
+# Loads calendar event pages, and starts the first one in the background right after login.
+# Kept apart from calendar_page so starting the prefetch doesn't import pandas or the event form:
+# none of database_manager, config or disk_cache import pandas, and disk_cache loads pyarrow lazily.
+
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from database_manager import DatabaseManager, get_data_version
+from typing import List, Dict, Any, Optional, Tuple
+import disk_cache
+
+logger = logging.getLogger(__name__)
+
+# How long events cached on disk stay fresh; the disk cache is cleared on event/org writes
+EVENTS_DISK_CACHE_TTL_SECONDS = 300
+
+# Events fetched per page; "Load More Events" fetches the next page from the database
+EVENTS_PAGE_SIZE = 50
+
+# How long to wait for a prefetch that is still running before fetching directly
+PREFETCH_WAIT_SECONDS = 5
+
+# First calendar page fetched in the background after login (see prefetch_calendar_events).
+# It is used at most once, and only if the org and event data haven't changed since it was started.
+_prefetch_executor = ThreadPoolExecutor(max_workers=2)
+_prefetch_lock = threading.Lock()
+_prefetch_future: Optional[Future] = None
+_prefetch_versions: Optional[Tuple[int, int]] = None
+
+def prefetch_calendar_events():
+    """
+    Starts fetching the first page of calendar events in a background thread,
+    so it is usually ready by the time the user opens the calendar.
+    """
+    global _prefetch_future, _prefetch_versions
+    with _prefetch_lock:
+        if _prefetch_future is not None:
+            return # A prefetch is already waiting to be used
+        _prefetch_versions = (get_data_version("orgs"), get_data_version("events"))
+        _prefetch_future = _prefetch_executor.submit(fetch_events_page, *_prefetch_versions, 0)
+
+def take_prefetched_first_page(orgs_version: int,
+                               events_version: int) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+    """
+    Returns the prefetched first page if one was started for these data versions, waiting
+    up to PREFETCH_WAIT_SECONDS for it; otherwise None. Either way the prefetch is discarded.
+    """
+    global _prefetch_future
+    with _prefetch_lock:
+        future, _prefetch_future = _prefetch_future, None
+        versions = _prefetch_versions
+    if future is None or versions != (orgs_version, events_version):
+        return None
+    try:
+        return future.result(timeout=PREFETCH_WAIT_SECONDS)
+    except Exception:
+        logger.exception("Prefetched calendar events unavailable, fetching directly")
+        return None
+
+def fetch_events_page(orgs_version: int, events_version: int,
+                      page: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Loads a page of public events. Below the in-process cache sits a parquet file
+    cache, so a restarted app doesn't have to go to the database for its first
+    calendar render. Safe to run off the script thread (no Streamlit calls).
+    The disk cache is keyed on the data versions the fetch started with, so a fetch
+    still in flight during a write can't save its pre-write page under the new versions.
+    """
+    # include_private, page, page size, data versions
+    cache_params = (False, page, EVENTS_PAGE_SIZE, orgs_version, events_version)
+    event_data = disk_cache.load_records("events", cache_params, EVENTS_DISK_CACHE_TTL_SECONDS)
+    if event_data is not None:
+        return event_data, None # The total isn't stored on disk
+
+    db_manager = DatabaseManager()
+    event_data, total_count = db_manager.get_events_page(page * EVENTS_PAGE_SIZE, EVENTS_PAGE_SIZE,
+                                                         include_private=False)
+    if event_data:
+        disk_cache.save_records("events", cache_params, event_data)
+    return event_data, total_count
@@ -0,0 +1,64 @@
+# config.py
+
+import os
+import atexit
+import threading
+import httpx
+from dotenv import load_dotenv
+from supabase import create_client, Client
+from typing import Dict
+
+# Load environment variables from the .env file (once, for every module that imports this one)
+load_dotenv()
+
+# --- Configuration: Loaded from the .env file ---
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+# SUPABASE_URL_POOLED optionally points data queries at a pooler-fronted endpoint;
+# when unset they use SUPABASE_URL like the auth client does.
+# Note: these are REST (PostgREST) calls, so Postgres connections are pooled server-side.
+# If a direct Postgres connection is ever added, use the Supavisor transaction pooler
+# (port 6543) with prepared statements disabled (e.g. statement_cache_size=0 for asyncpg).
+SUPABASE_DATA_URL = os.getenv("SUPABASE_URL_POOLED") or SUPABASE_URL
+# ------------------------------------------------
+
+# Connection pool for PostgREST requests: keep-alive connections are reused across
+# queries and bounded so a burst of reruns can't open unlimited sockets.
+# POSTGREST_MAX_CONNECTIONS caps the concurrent requests this process sends (default 20);
+# lower it when many app instances share a project's connection budget.
+POSTGREST_MAX_CONNECTIONS = int(os.getenv("POSTGREST_MAX_CONNECTIONS", "20"))
+POSTGREST_POOL_LIMITS = httpx.Limits(max_connections=POSTGREST_MAX_CONNECTIONS,
+                                     max_keepalive_connections=min(15, POSTGREST_MAX_CONNECTIONS))
+POSTGREST_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+def _pooled_postgrest_session(session: httpx.Client) -> httpx.Client:
+    """
+    Replaces supabase-py's default PostgREST session with one using our pool
+    limits and timeouts, keeping its base URL and auth headers.
+    """
+    pooled_session = httpx.Client(base_url=session.base_url,
+                                  headers=session.headers,
+                                  limits=POSTGREST_POOL_LIMITS,
+                                  timeout=POSTGREST_TIMEOUT,
+                                  follow_redirects=True)
+    session.close()
+    atexit.register(pooled_session.close)
+    return pooled_session
+
+# Data clients are created lazily, once per (url, key), and shared by every
+# DatabaseManager in the process so each instantiation doesn't set up a new HTTP session.
+_clients: Dict[tuple, Client] = {}
+_clients_lock = threading.Lock()
+
+def get_client(url: str = SUPABASE_DATA_URL, key: str = SUPABASE_KEY) -> Client:
+    """Returns the process-wide Supabase client for the given URL and key, creating it on first use."""
+    client = _clients.get((url, key))
+    if client is None:
+        with _clients_lock:
+            client = _clients.get((url, key))
+            if client is None:
+                client = create_client(supabase_url=url, supabase_key=key)
+                client.postgrest.session = _pooled_postgrest_session(client.postgrest.session)
+                _clients[(url, key)] = client
+    return client
@@ -1,29 +1,76 @@
 # database_manager.py (COMPREHENSIVE HARMONIZED VERSION)
 
-from dotenv import load_dotenv
-import os
-from supabase import create_client, Client
-from typing import List, Dict, Any, Optional
+import streamlit as st
+from supabase import Client
+from config import SUPABASE_DATA_URL, SUPABASE_KEY, get_client
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime # Still needed for event logic if dates are manipulated here
+import logging
 
-# Load environment variables from the .env file
-load_dotenv()
+# Failed queries are logged with their traceback; handlers/levels come from the app's logging config
+logger = logging.getLogger(__name__)
 
-# --- Configuration: Loaded from the .env file ---
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-# ------------------------------------------------
+# ====================================================================
+# CACHED PER-KEY READS
+# = Profile, organization and per-user membership lookups repeat across page
+# = renders, so they are cached for a short TTL. A missing row is returned (and cached) as None;
+# = request errors are raised rather than returned, so failures are never cached.
+# = The _client argument is skipped when Streamlit builds the cache key.
+# ====================================================================
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_user_profile(_client: Client, user_id: str) -> Optional[Dict[str, Any]]:
+    """Fetches a user's profile row by id."""
+    rows = _client.table("users").select("*").eq("id", user_id).limit(1).execute().data
+    return rows[0] if rows else None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_organization(_client: Client, org_id: str) -> Optional[Dict[str, Any]]:
+    """Fetches an organization row by id."""
+    rows = _client.table("organizations").select("*").eq("id", org_id).limit(1).execute().data
+    return rows[0] if rows else None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_user_orgs(_client: Client, user_id: str) -> List[Dict[str, Any]]:
+    """Fetches the organizations a user belongs to, flattened to one dict per membership."""
+    rows = (_client.table("memberships")
+            .select("role, organizations!inner(id, name, category, description)") # Only the org columns the profile page shows
+            .eq("user_id", user_id)
+            .execute()
+            .data)
+    # Flatten the nested organization data for easier use (one comprehension, no per-row appends)
+    return [{
+                'membership_role': membership.get('role'),
+                'org_id': org_info.get('id'),
+                'org_name': org_info.get('name'),
+                'org_category': org_info.get('category'),
+                'org_description': org_info.get('description')
+            }
+            for membership in rows or []
+            if (org_info := membership.get('organizations'))]
+
+def invalidate_user_profile(user_id: str):
+    """Drops the cached profile for a user after it is created or changed."""
+    _fetch_user_profile.clear(None, user_id)
+
+def invalidate_organization(org_id: str):
+    """Drops the cached organization row after it is updated or deleted."""
+    _fetch_organization.clear(None, org_id)
+
+def invalidate_user_orgs(user_id: str):
+    """Drops the cached membership list for a user after they join or leave an organization."""
+    _fetch_user_orgs.clear(None, user_id)
 
 class DatabaseManager:
     """
     Manages all interactions (CRUD operations) with the Supabase database
     using the HTTPS REST API.
     """
-    def __init__(self, url: str = SUPABASE_URL, key: str = SUPABASE_KEY):
+    def __init__(self, url: str = SUPABASE_DATA_URL, key: str = SUPABASE_KEY):
         if not url or not key:
             raise ValueError("Supabase URL and Key must be provided or loaded from the .env file.")
             
-        self.supabase: Client = create_client(supabase_url=url, supabase_key=key)
+        self.supabase: Client = get_client(url, key)
         # print("DatabaseManager initialized.") # Only for debugging, can remove later
 
     # ====================================================================
@@ -32,42 +79,42 @@ class DatabaseManager:
     # ====================================================================
 
     def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Fetches a user's profile from the public.users table by user_id."""
+        """Fetches a user's profile from the public.users table by user_id (cached briefly)."""
         try:
-            response = self.supabase.table("users").select("*").eq("id", user_id).single().execute()
-            return response.data
-        except Exception as e:
-            # print(f"Error fetching user profile for {user_id}: {e}") # Debugging
+            return _fetch_user_profile(self.supabase, user_id)
+        except Exception:
+            logger.exception(f"Error fetching user profile for {user_id}")
             return None
 
     def create_user_profile(self, user_id: str, email: str, full_name: str, grad_year: int, role: str) -> bool:
         """Creates a new user profile in the public.users table."""
         try:
-            # Check if profile already exists to prevent duplicates during concurrent signups
-            existing_profile = self.get_user_profile(user_id)
-            if existing_profile:
-                # print(f"Profile for {email} already exists, skipping creation.") # Debugging
-                return True # Consider it a success if it already exists
-                
-            response = self.supabase.table("users").insert({
+            # Upsert that skips existing ids, so concurrent signups can't create duplicates
+            # without a separate existence check first
+            self.supabase.table("users").upsert({
                 "id": user_id,
                 "email": email,
                 "full_name": full_name,
                 "grad_year": grad_year,
                 "role": role
-            }).execute()
-            return bool(response.data)
-        except Exception as e:
-            print(f"Error creating user profile for {email}: {e}")
+            }, on_conflict="id", ignore_duplicates=True).execute()
+            invalidate_user_profile(user_id)
+            return True # Consider it a success if it already exists
+        except Exception:
+            logger.exception(f"Error creating user profile for {email}")
             return False
 
-    def get_all_users_with_profiles(self) -> List[Dict[str, Any]]:
-        """Fetches all user profiles from the public.users table."""
+    def get_all_users_with_profiles(self, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetches all user profiles from the public.users table.
+        Pass columns to select only those fields instead of the full row.
+        """
         try:
-            response = self.supabase.table("users").select("*").order("full_name").execute()
+            select_clause = ", ".join(columns) if columns else "*"
+            response = self.supabase.table("users").select(select_clause).order("full_name").execute()
             return response.data if response.data else []
-        except Exception as e:
-            print(f"Error fetching all user profiles: {e}")
+        except Exception:
+            logger.exception("Error fetching all user profiles")
             return []
 
     def update_user_role(self, user_id: str, new_role: str) -> bool:
@@ -77,49 +124,107 @@ class DatabaseManager:
                         .update({"role": new_role})
                         .eq("id", user_id)
                         .execute())
+            invalidate_user_profile(user_id)
             return bool(response.data) # Return bool for success/failure
-        except Exception as e:
-            print(f"Error updating role for user {user_id}: {e}")
+        except Exception:
+            logger.exception(f"Error updating role for user {user_id}")
             return False
 
     # ====================================================================
     # ORGANIZATION FUNCTIONS (Mapping to public.organizations table)
     # ====================================================================
 
-    def get_org_directory(self) -> List[Dict[str, Any]]:
-        """Retrieves all organizations, ordered by name, for the directory page."""
+    def get_org_directory(self, categories: Optional[List[str]] = None, verified: Optional[bool] = None,
+                          name_contains: Optional[str] = None,
+                          columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieves all organizations, ordered by name, for the directory page.
+        The optional filters are applied in the database query rather than client-side.
+        Pass columns to select only those fields instead of the full row.
+        """
         try:
-            response = (self.supabase.table("organizations")
-                        .select("*")
-                        .order("name")
-                        .execute())
+            query = self._org_directory_query(categories, verified, name_contains, columns)
+            response = query.order("name").execute()
             return response.data if response.data else []
-        except Exception as e:
-            print(f"Error fetching organization directory: {e}")
+        except Exception:
+            logger.exception("Error fetching organization directory")
             return []
 
-    def get_organization_by_id(self, org_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieves a single organization by its ID."""
+    def get_org_directory_page(self, limit: int, after: Optional[Tuple[str, str]] = None,
+                               categories: Optional[List[str]] = None, verified: Optional[bool] = None,
+                               name_contains: Optional[str] = None,
+                               columns: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Retrieves one page of the organization directory (same filters as get_org_directory),
+        ordered by name then id. Pages are keyset-paginated: pass the (name, id) of the last
+        row of the previous page as after, so the database seeks past it instead of counting
+        an OFFSET. The first page (after=None) also returns the total number of matching
+        organizations; other pages return None. columns must include name and id.
+        """
         try:
-            response = (self.supabase.table("organizations")
-                        .select("*")
-                        .eq("id", org_id)
-                        .single()
+            query = self._org_directory_query(categories, verified, name_contains, columns,
+                                              count="exact" if after is None else None)
+            if after is not None:
+                last_name, last_id = (self._quote_filter_value(value) for value in after)
+                query = query.or_(f"name.gt.{last_name},and(name.eq.{last_name},id.gt.{last_id})")
+            # Order by id as well so organizations with the same name have a stable position
+            response = (query.order("name")
+                        .order("id")
+                        .limit(limit)
                         .execute())
-            return response.data
-        except Exception as e:
-            # Supabase client often raises an error if single() returns 0 rows
-            # print(f"Error fetching organization {org_id}: {e}") # Debugging
-            return None
-            
-    def add_organization(self, org_data: Dict[str, Any]) -> bool: # Changed return to bool for consistency
-        """Inserts a new organization record."""
+            return response.data or [], response.count
+        except Exception:
+            logger.exception(f"Error fetching organization directory page after {after}")
+            return [], None
+
+    @staticmethod
+    def _escape_like(text: str) -> str:
+        """Escapes LIKE wildcards (% and _) and the escape character itself, so user text matches literally."""
+        # PostgREST rewrites every * in a like/ilike pattern to %, and that can't be escaped, so * is dropped
+        text = text.replace('*', '')
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    @staticmethod
+    def _quote_filter_value(value: Any) -> str:
+        """Quotes a value for a PostgREST or=(...) filter, so commas and parentheses in it are literal."""
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+        return f'"{escaped}"'
+
+    def _org_directory_query(self, categories: Optional[List[str]], verified: Optional[bool],
+                             name_contains: Optional[str], columns: Optional[List[str]],
+                             count: Optional[str] = None):
+        """Builds the filtered organizations query shared by the directory methods."""
+        select_clause = ", ".join(columns) if columns else "*"
+        query = self.supabase.table("organizations").select(select_clause, count=count)
+
+        if categories:
+            query = query.in_("category", list(categories))
+        if verified is not None:
+            query = query.eq("is_verified", verified)
+        if name_contains:
+            query = query.ilike("name", f"%{self._escape_like(name_contains)}%")
+        return query
+
+    def get_org_name_id_pairs(self) -> List[Dict[str, Any]]:
+        """Retrieves just the id and name of every organization, ordered by name (e.g. for dropdowns)."""
+        return self.get_org_directory(columns=["id", "name"])
+
+    def get_distinct_categories(self) -> List[str]:
+        """Returns the sorted categories in use (organizations without one are skipped), from the org_categories view."""
         try:
-            response = self.supabase.table("organizations").insert(org_data).execute()
-            return bool(response.data)
-        except Exception as e:
-            print(f"Error adding organization: {e}")
-            return False
+            response = self.supabase.table("org_categories").select("category").order("category").execute()
+            return [row['category'] for row in response.data or []]
+        except Exception:
+            logger.exception("Error fetching organization categories")
+            return []
+
+    def get_organization_by_id(self, org_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieves a single organization by its ID (cached briefly)."""
+        try:
+            return _fetch_organization(self.supabase, org_id)
+        except Exception:
+            logger.exception(f"Error fetching organization {org_id}")
+            return None
 
     # (Other org functions like update_org_description, delete_organization can stay if you use them)
 
@@ -129,63 +234,54 @@ class DatabaseManager:
 
     def get_orgs_for_user(self, user_id: str) -> List[Dict[str, Any]]:
         """
-        Fetches all organizations a given user belongs to, with organization details.
+        Fetches all organizations a given user belongs to, with organization details (cached briefly).
         """
         try:
-            response = (self.supabase.table("memberships")
-                        .select("role, organizations!inner(id, name, category, description)") # Join to get full org data
-                        .eq("user_id", user_id)
-                        .execute())
-            
-            # Flatten the nested organization data for easier use
-            if response.data:
-                flattened_data = []
-                for membership in response.data:
-                    org_info = membership.get('organizations', {})
-                    if org_info:
-                        flattened_data.append({
-                            'membership_role': membership.get('role'),
-                            'org_id': org_info.get('id'),
-                            'org_name': org_info.get('name'),
-                            'org_category': org_info.get('category'),
-                            'org_description': org_info.get('description')
-                        })
-                return flattened_data
-            return []
-        except Exception as e:
-            print(f"Error fetching organizations for user {user_id}: {e}")
+            return _fetch_user_orgs(self.supabase, user_id)
+        except Exception:
+            logger.exception(f"Error fetching organizations for user {user_id}")
             return []
 
+    # Roster columns, as exposed by the org_rosters view (memberships joined to users)
+    ROSTER_SELECT = "user_id, membership_role, full_name, email, grad_year"
+
     def get_memberships_for_org(self, org_id: str) -> List[Dict[str, Any]]:
         """
         Fetches the roster for a given organization, including user details.
+        Rows come from the org_rosters view already flat, so no reshaping is needed.
         """
         try:
-            response = (self.supabase.table("memberships")
-                        .select("role, users!inner(id, full_name, email, grad_year)") # Join to get user details
+            response = (self.supabase.table("org_rosters")
+                        .select(self.ROSTER_SELECT)
                         .eq("organization_id", org_id)
-                        .order("role", desc=True) # Order by role to put leaders first
+                        .order("membership_role", desc=True) # Order by role to put leaders first
                         .execute())
-
-            # Flatten the nested user data for easier use
-            if response.data:
-                flattened_data = []
-                for membership in response.data:
-                    user_info = membership.get('users', {})
-                    if user_info:
-                        flattened_data.append({
-                            'membership_role': membership.get('role'),
-                            'user_id': user_info.get('id'),
-                            'full_name': user_info.get('full_name'),
-                            'email': user_info.get('email'),
-                            'grad_year': user_info.get('grad_year')
-                        })
-                return flattened_data
-            return []
-        except Exception as e:
-            print(f"Error fetching memberships for organization {org_id}: {e}")
+            return response.data if response.data else []
+        except Exception:
+            logger.exception(f"Error fetching memberships for organization {org_id}")
             return []
 
+    def get_org_with_roster(self, org_id: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Fetches an organization and its roster (with user details) in one request,
+        by embedding the org_rosters view in the organization query.
+        Returns (organization or None, roster in the same shape as get_memberships_for_org).
+        """
+        try:
+            response = (self.supabase.table("organizations")
+                        .select(f"*, org_rosters({self.ROSTER_SELECT})")
+                        .eq("id", org_id)
+                        .order("membership_role", desc=True, foreign_table="org_rosters") # Leaders first, as in get_memberships_for_org
+                        .limit(1)
+                        .execute())
+            if not response.data:
+                return None, []
+            org_data = response.data[0]
+            return org_data, org_data.pop('org_rosters', None) or []
+        except Exception:
+            logger.exception(f"Error fetching organization {org_id} with roster")
+            return None, []
+
     def get_user_org_membership_status(self, user_id: str, org_id: str) -> Optional[Dict[str, Any]]:
         """
         Checks if a user is a member of a specific organization and returns the membership record if found.
@@ -195,27 +291,26 @@ class DatabaseManager:
                         .select("*")
                         .eq("user_id", user_id)
                         .eq("organization_id", org_id)
-                        .single()
+                        .limit(1) # Zero rows is a normal answer here, unlike single() which raises
                         .execute())
-            return response.data
-        except Exception as e:
-            # print(f"Error checking membership status for user {user_id} in org {org_id}: {e}") # Debugging
-            return None # Return None if no record or an error occurs
+            return response.data[0] if response.data else None # None if no record
+        except Exception:
+            logger.exception(f"Error checking membership status for user {user_id} in org {org_id}")
+            return None
 
     def join_organization(self, user_id: str, org_id: str, role: str = "member") -> bool:
         """Adds a user as a member to an organization."""
         try:
-            existing_membership = self.get_user_org_membership_status(user_id, org_id)
-            if existing_membership:
-                # print("You are already a member of this organization.") # Debugging
-                return False # Indicate that it was not 'joined' because already a member
-
+            # A single upsert that ignores an existing (user_id, organization_id) row replaces
+            # the old check-then-insert; only newly inserted rows come back in response.data
             response = (self.supabase.table("memberships")
-                        .insert({"user_id": user_id, "organization_id": org_id, "role": role})
+                        .upsert({"user_id": user_id, "organization_id": org_id, "role": role},
+                                on_conflict="user_id,organization_id", ignore_duplicates=True)
                         .execute())
-            return bool(response.data)
-        except Exception as e:
-            print(f"Error joining organization {org_id} for user {user_id}: {e}")
+            invalidate_user_orgs(user_id)
+            return bool(response.data) # False if already a member
+        except Exception:
+            logger.exception(f"Error joining organization {org_id} for user {user_id}")
             return False
 
     def leave_organization(self, user_id: str, org_id: str) -> bool:
@@ -226,11 +321,28 @@ class DatabaseManager:
                         .eq("user_id", user_id)
                         .eq("organization_id", org_id)
                         .execute())
+            invalidate_user_orgs(user_id)
             return bool(response.data)
-        except Exception as e:
-            print(f"Error leaving organization {org_id} for user {user_id}: {e}")
+        except Exception:
+            logger.exception(f"Error leaving organization {org_id} for user {user_id}")
             return False
-            
+
+    def add_memberships(self, memberships: List[Dict[str, Any]]) -> int:
+        """
+        Inserts several membership records (e.g. a roster import) in one request.
+        Returns the number of rows inserted, or 0 on failure.
+        """
+        if not memberships:
+            return 0
+        try:
+            response = self.supabase.table("memberships").insert(memberships).execute()
+            for user_id in {membership['user_id'] for membership in memberships}:
+                invalidate_user_orgs(user_id)
+            return len(response.data) if response.data else 0
+        except Exception:
+            logger.exception(f"Error adding {len(memberships)} memberships")
+            return 0
+
     # (Other membership functions like update_membership_role, remove_membership can stay if you use them)
 
     # ====================================================================
@@ -239,71 +351,175 @@ class DatabaseManager:
 
     def add_event(self, event_data: Dict[str, Any]) -> bool: # Changed return to bool for consistency
         """Inserts a new event record."""
+        return self.add_events([event_data]) == 1
+
+    def add_events(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Inserts several event records in one request.
+        Returns the number of rows inserted, or 0 on failure.
+        """
+        if not events:
+            return 0
         try:
-            response = self.supabase.table("events").insert(event_data).execute()
-            return bool(response.data)
-        except Exception as e:
-            print(f"Error adding event: {e}")
-            return False
+            response = self.supabase.table("events").insert(events).execute()
+            return len(response.data) if response.data else 0
+        except Exception:
+            logger.exception(f"Error adding {len(events)} events")
+            return 0
+
+    # Columns the calendar displays (plus is_public), with the host organization embedded
+    EVENT_DISPLAY_SELECT = "id, title, location, start_time, end_time, is_public, organizations(name, category)"
 
     def get_all_events(self, include_private: bool = False) -> List[Dict[str, Any]]:
         """
-        Retrieves all public events, optionally including private ones,
-        and flattens organization details for Streamlit display.
+        Retrieves all public events, optionally including private ones, with only
+        the columns the calendar displays, and flattens organization details.
+        """
+        return self._get_events(self.EVENT_DISPLAY_SELECT, include_private)
+
+    def get_all_events_full(self, include_private: bool = False) -> List[Dict[str, Any]]:
+        """Same as get_all_events, but with every event column (e.g. for admin views)."""
+        return self._get_events("*, organizations(name, category)", include_private)
+
+    def get_events_page(self, offset: int, limit: int,
+                        include_private: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Retrieves one page of events (same columns as get_all_events), with the
+        range pushed into the query as a LIMIT/OFFSET. The first page (offset 0)
+        also returns the total number of matching events; other pages return None.
+        """
+        try:
+            query = self.supabase.table("events").select(self.EVENT_DISPLAY_SELECT,
+                                                         count="exact" if offset == 0 else None)
+
+            if not include_private:
+                query = query.eq("is_public", True)
+
+            # Order by id as well so rows with the same start time don't shift between pages
+            response = (query.order("start_time", desc=False)
+                        .order("id")
+                        .range(offset, offset + limit - 1)
+                        .execute())
+            return self._flatten_events(response.data), response.count
+        except Exception:
+            logger.exception(f"Error fetching events {offset}-{offset + limit - 1}")
+            return [], None
+
+    def _get_events(self, select_clause: str, include_private: bool) -> List[Dict[str, Any]]:
+        """
+        Runs the events query with the given select clause and
+        flattens organization details for Streamlit display.
         """
         try:
-            query = self.supabase.table("events").select("*, organizations(name, category)")
+            query = self.supabase.table("events").select(select_clause)
             
             if not include_private:
                 query = query.eq("is_public", True)
                 
             response = query.order("start_time", desc=False).execute()
-            
-            # Flatten the data structure slightly for easier use in Streamlit
-            if response.data:
-                flattened_data = []
-                for event in response.data:
-                    # Pull the organization name and category up to the top level
-                    if event.get('organizations'):
-                        event['organization_name'] = event['organizations']['name']
-                        event['organization_category'] = event['organizations']['category']
-                    # Remove the nested organization data (optional, but good for cleanliness)
-                    event.pop('organizations', None)
-                    flattened_data.append(event)
-                return flattened_data
-            
-            return []
-        except Exception as e:
-            print(f"Error fetching all events: {e}")
+            return self._flatten_events(response.data)
+        except Exception:
+            logger.exception("Error fetching all events")
             return []
 
+    @staticmethod
+    def _flatten_events(events: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Flattens the data structure slightly for easier use in Streamlit: copies each event
+        without the nested organization and pulls its name and category up to the top level.
+        """
+        return [{**{key: value for key, value in event.items() if key != 'organizations'},
+                 'organization_name': (event.get('organizations') or {}).get('name'),
+                 'organization_category': (event.get('organizations') or {}).get('category')}
+                for event in events or []]
+
+    def get_orgs_by_ids(self, org_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Retrieves several organizations by ID in one request, ordered by name.
+        Use this instead of calling get_organization_by_id in a loop.
+        """
+        if not org_ids:
+            return []
+        try:
+            response = (self.supabase.table("organizations")
+                        .select("*")
+                        .in_("id", list(org_ids))
+                        .order("name")
+                        .execute())
+            return response.data if response.data else []
+        except Exception:
+            logger.exception(f"Error fetching organizations {org_ids}")
+            return []
 
     def add_organization(self, org_data: Dict[str, Any]) -> Dict[str, Any] | None:
+        """Inserts a new organization record and returns it, or None on failure."""
+        inserted = self.add_organizations([org_data])
+        return inserted[0] if inserted else None
+
+    def add_organizations(self, orgs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Inserts several organization records (e.g. a CSV import) in one multi-row INSERT.
+        Returns the inserted rows, or an empty list on failure.
+        """
+        if not orgs:
+            return []
         try:
-            response = self.supabase.table("organizations").insert(org_data).execute()
-            return response.data[0] if response.data else None
-        except Exception as e:
-            st.error(f"Error adding organization: {e}")
-            return None
+            response = self.supabase.table("organizations").insert(orgs).execute()
+            return response.data if response.data else []
+        except Exception:
+            logger.exception(f"Error adding {len(orgs)} organizations")
+            return []
 
     def update_organization(self, org_id: str, org_data: Dict[str, Any]) -> bool:
         """Updates an existing organization's details."""
         try:
             response = self.supabase.table("organizations").update(org_data).eq("id", org_id).execute()
+            invalidate_organization(org_id)
             return bool(response.data) # Returns True if data was updated
-        except Exception as e:
-            st.error(f"Error updating organization {org_id}: {e}")
+        except Exception:
+            logger.exception(f"Error updating organization {org_id}")
             return False
 
     def delete_organization(self, org_id: str) -> bool:
         """Deletes an organization by its ID."""
         try:
             response = self.supabase.table("organizations").delete().eq("id", org_id).execute()
+            invalidate_organization(org_id)
             # Supabase delete returns data even on successful deletion,
             # so checking if data is present usually means something was deleted.
             return bool(response.data) 
-        except Exception as e:
-            st.error(f"Error deleting organization {org_id}: {e}")
+        except Exception:
+            logger.exception(f"Error deleting organization {org_id}")
             return False
 
-    
\ No newline at end of file
+    
+
+
+@st.cache_resource
+def get_db_manager() -> DatabaseManager:
+    """
+    Returns a single DatabaseManager shared across reruns and sessions,
+    so the Supabase client is created once per process instead of per rerun.
+    """
+    return DatabaseManager()
+
+
+# ====================================================================
+# CACHE VERSIONING
+# = Cached page loaders take a resource's version as an argument, so bumping
+# = it after a write re-fetches only that resource instead of clearing every cache.
+# ====================================================================
+
+@st.cache_resource
+def _data_versions() -> Dict[str, int]:
+    """Process-wide version counters, one per resource (e.g. "orgs", "users")."""
+    return {}
+
+def get_data_version(resource: str) -> int:
+    """Returns the current version of a resource, for use as a cache key."""
+    return _data_versions().get(resource, 0)
+
+def bump_data_version(resource: str):
+    """Marks a resource as changed so cached reads keyed on its version re-fetch."""
+    versions = _data_versions()
+    versions[resource] = versions.get(resource, 0) + 1
@@ -1,34 +1,32 @@
 # detail_page.py (Updated for Membership Management and Auth)
 
 import streamlit as st
-from database_manager import DatabaseManager
-from auth_manager import AuthManager # <-- NEW IMPORT
+from database_manager import get_db_manager, get_data_version
+from auth_manager import get_auth_manager
 from typing import Optional, Dict, Any, List
 import pandas as pd
 
-# --- Initialize AuthManager and DatabaseManager globally or pass them ---
-# For simplicity, we'll initialize them inside the function as they are lightweight
-# or pass them around if performance became an issue for many instances.
+# --- DatabaseManager comes from get_db_manager(), one shared instance per process ---
 
 @st.cache_data(show_spinner="Fetching club details...")
-def get_group_data(org_id: str):
-    """Fetches the organization and its full roster for the detail page."""
-    db_manager = DatabaseManager() # Initialize here for cache scope
+def get_group_data(org_id: str, orgs_version: int):
+    """
+    Fetches the organization and its full roster for the detail page.
+    orgs_version is a cache key that changes whenever organizations are edited.
+    """
+    db_manager = get_db_manager()
     
-    # 1. Fetch Organization Data (Header/About Section)
-    org_data = db_manager.get_organization_by_id(org_id)
-    
-    # 2. Fetch Membership Data (Roster Section)
-    # This uses the JOIN query to get user details linked to the membership
-    roster_data = db_manager.get_memberships_for_org(org_id)
+    # One request for both the Organization Data (Header/About Section) and the
+    # Membership Data (Roster Section), with user details embedded in the memberships
+    org_data, roster_data = db_manager.get_org_with_roster(org_id)
     
     return org_data, roster_data
 
 def show_group_detail():
     """Implements the Group Detail Page wireframe with membership management."""
     
-    db_manager = DatabaseManager() # Initialize DatabaseManager
-    auth = AuthManager() # Initialize AuthManager
+    db_manager = get_db_manager() # Shared DatabaseManager
+    auth = get_auth_manager() # This session's AuthManager
 
     # Retrieve the ID of the organization selected from the directory page
     org_id = st.session_state.get('selected_org_id')
@@ -40,7 +38,7 @@ def show_group_detail():
         return
 
     # Fetch all data using the cached function
-    org, roster_raw = get_group_data(org_id)
+    org, roster_raw = get_group_data(org_id, get_data_version("orgs"))
     
     if not org:
         st.error(f"Organization with ID {org_id} not found.")
@@ -94,17 +92,17 @@ def show_group_detail():
         current_user = auth.get_current_user()
         user_id = current_user['id']
         
-        # Check user's membership status for this specific organization
-        membership_status = db_manager.get_user_org_membership_status(user_id, org_id)
+        # User's membership in this organization, looked up in the roster we already have
+        membership_status = next((member for member in roster_raw if member.get('user_id') == user_id), None)
 
         col1_member_status, col2_member_action = st.columns(2)
 
         if membership_status:
-            col1_member_status.success(f"You are a member ({membership_status['role'].title()}).")
+            col1_member_status.success(f"You are a member ({membership_status['membership_role'].title()}).")
             if col2_member_action.button("Leave Organization", type="secondary", key=f"leave_org_{org_id}"):
                 if db_manager.leave_organization(user_id, org_id):
                     st.success("You have left the organization.")
-                    st.cache_data.clear() # Clear cache to refresh roster and membership status
+                    get_group_data.clear(org_id, get_data_version("orgs")) # Refresh only this org's roster
                     st.rerun()
                 else:
                     st.error("Failed to leave organization. Please try again.") 
@@ -113,7 +111,7 @@ def show_group_detail():
             if col2_member_action.button("Join Organization", type="primary", key=f"join_org_{org_id}"):
                 if db_manager.join_organization(user_id, org_id):
                     st.success("You have joined the organization as a member.")
-                    st.cache_data.clear() # Clear cache to refresh roster and membership status
+                    get_group_data.clear(org_id, get_data_version("orgs")) # Refresh only this org's roster
                     st.rerun()
                 else:
                     st.error("Failed to join organization. Please try again.") 
@@ -129,18 +127,16 @@ def show_group_detail():
     
     # Use the fresh roster_raw data
     if roster_raw:
-        # Reformat the roster data for display - NOW USING FLATTENED DATA
-        roster_formatted = []
-        for item in roster_raw:
-            # Direct access to the flattened keys
-            roster_formatted.append({
-                "Role": item.get('membership_role', 'Member').title(), # Access 'membership_role'
-                "Name": item.get('full_name', 'Unknown User'),         # Access 'full_name' directly
-                "Email": item.get('email', 'N/A'),                     # Access 'email' directly
-                "Status": f"Class of {item.get('grad_year')}" if item.get('grad_year') else item.get('membership_role', 'N/A').title()
-            })
-
-        roster_df = pd.DataFrame(roster_formatted)
+        # Reformat the flattened roster for display with whole-column operations instead of a per-row loop
+        roster = pd.DataFrame.from_records(roster_raw, columns=['membership_role', 'full_name', 'email', 'grad_year'])
+        roster_df = pd.DataFrame({
+            "Role": roster['membership_role'].fillna('Member').str.title(),
+            "Name": roster['full_name'].fillna('Unknown User'),
+            "Email": roster['email'].fillna('N/A'),
+        })
+        # "Class of <year>" when a graduation year is known, otherwise the role
+        grad_year = pd.to_numeric(roster['grad_year'], errors='coerce').astype('Int64')
+        roster_df["Status"] = ("Class of " + grad_year.astype(str)).where(grad_year.notna(), roster_df["Role"])
         
         # Display the roster table
         st.dataframe(roster_df, 
@@ -1,19 +1,42 @@
 import streamlit as st
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 # IMPORT FROM YOUR NEW FILE: 
 # This line assumes you created database_manager.py and put the class there.
-from database_manager import DatabaseManager 
+from database_manager import get_db_manager, get_data_version
+
+# Only the fields an organization card renders; description_snippet is the first
+# DESCRIPTION_SNIPPET_LENGTH + 1 characters of the description, generated in the database
+DIRECTORY_CARD_COLUMNS = ["id", "name", "category", "description_snippet", "is_verified"]
+DESCRIPTION_SNIPPET_LENGTH = 100
+
+# Cards fetched per page (a multiple of the 3-column grid); "Load More" fetches the next page
+DIRECTORY_PAGE_SIZE = 24
 
 # --- Data Fetching and Caching ---
 
-@st.cache_data
-def get_data_for_directory():
-    """Initializes DB Manager and fetches data, caching the result."""
-    # DatabaseManager now initializes and loads config from .env file inside its __init__
-    db_manager = DatabaseManager() 
+@st.cache_data(ttl=600)
+def get_data_for_directory(orgs_version: int, search_query: str = "", category: Optional[str] = None,
+                           after: Optional[Tuple[str, str]] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """
+    Initializes DB Manager and fetches one page of the organizations matching the
+    search and category filter, caching the result for up to 10 minutes.
+    after is the (name, id) of the last organization on the previous page (None for the first page).
+    Returns (rows, total); the total is only known for the first page and is None otherwise.
+    orgs_version is a cache key that changes whenever organizations are edited.
+    """
+    # Shared DatabaseManager (config is loaded once per process in config.py)
+    db_manager = get_db_manager()
     
-    # We only need the get_org_directory method for this page
-    return db_manager.get_org_directory()
+    # Filtering and paging happen in the query, so only the rows shown are transferred
+    return db_manager.get_org_directory_page(DIRECTORY_PAGE_SIZE, after,
+                                             categories=[category] if category else None,
+                                             name_contains=search_query or None,
+                                             columns=DIRECTORY_CARD_COLUMNS)
+
+@st.cache_data(ttl=3600)
+def get_directory_categories(orgs_version: int) -> List[str]:
+    """Returns the sorted list of categories in use, for the category filter."""
+    return get_db_manager().get_distinct_categories()
 
 # --- Page Rendering ---
 
@@ -21,41 +44,41 @@ def show_directory():
     """Implements the Groups Page (Directory List) wireframe."""
     st.title("📚 Clubs, Teams, and Organizations Directory")
     
-    # 1. Fetch Data
-    org_data = get_data_for_directory()
-    
-    if not org_data:
-        st.info("No organizations found in the database yet.")
-        return
+    orgs_version = get_data_version("orgs")
 
-    # 2. Search Bar and Category Filters (Top Row)
+    # 1. Search Bar and Category Filters (Top Row)
     col1, col2 = st.columns([3, 1])
     
-    # Create the set of unique categories for filtering
-    # If a club has no category, it will appear as None/null, so we handle that:
-    all_categories = sorted(list(set(org.get('category') for org in org_data if org.get('category'))))
-    
     # Search Bar
-    search_query = col1.text_input("Search Clubs by Name", key="search").lower()
+    search_query = col1.text_input("Search Clubs by Name", key="search").strip()
     
     # Category Filter Dropdown
     selected_category = col2.selectbox("Filter by Category", 
-                                        options=['All'] + all_categories, 
+                                        options=['All'] + get_directory_categories(orgs_version), 
                                         key="filter")
 
-    # 3. Filter Logic
-    filtered_orgs = []
-    for org in org_data:
-        # Filter by category (Handles potential None category)
-        category_match = (selected_category == 'All') or (org.get('category') == selected_category)
-        
-        # Filter by search query
-        search_match = search_query in org['name'].lower()
-        
-        if category_match and search_match:
-            filtered_orgs.append(org)
+    # 2. Fetch Data (name search is case-insensitive via ilike)
+    category_filter = None if selected_category == 'All' else selected_category
+
+    # Start again from the first page whenever the search or category changes
+    if st.session_state.get('directory_filters') != (search_query, category_filter):
+        st.session_state.directory_filters = (search_query, category_filter)
+        st.session_state.directory_pages_loaded = 1
+
+    # Each page starts after the last organization of the one before it (keyset pagination)
+    filtered_orgs, total_orgs = get_data_for_directory(orgs_version, search_query, category_filter)
+    for page in range(1, st.session_state.directory_pages_loaded):
+        if not filtered_orgs:
+            break
+        cursor = (filtered_orgs[-1]['name'], filtered_orgs[-1]['id'])
+        page_orgs, _ = get_data_for_directory(orgs_version, search_query, category_filter, cursor)
+        filtered_orgs = filtered_orgs + page_orgs
+    
+    if not filtered_orgs and not search_query and selected_category == 'All':
+        st.info("No organizations found in the database yet.")
+        return
             
-    # 4. Display the Directory List (Grid Layout for Cards)
+    # 3. Display the Directory List (Grid Layout for Cards)
     st.markdown("---")
     
     # Use st.columns to create a card-like grid (e.g., 3 columns)
@@ -82,12 +105,24 @@ def show_directory():
                     st.success("✅ Officially Verified", icon="⭐")
                 
                 # Brief Description (Show only the first 100 characters)
-                description_snippet = org.get('description', 'No description provided.')
-                st.markdown(f"**Description:** {description_snippet[:100]}{'...' if len(description_snippet) > 100 else ''}")
+                description_snippet = org.get('description_snippet') or 'No description provided.'
+                st.markdown(f"**Description:** {description_snippet[:DESCRIPTION_SNIPPET_LENGTH]}"
+                            f"{'...' if len(description_snippet) > DESCRIPTION_SNIPPET_LENGTH else ''}")
                 
                 # Link to Detail Page 
                 if st.button(f"View Profile", key=f"btn_{org['id']}"):
                     # Sets the state to switch to the Detail Page
                     st.session_state.selected_org_id = org['id']
                     st.session_state.current_page = "detail" 
-                    st.rerun()
\ No newline at end of file
+                    st.rerun()
+
+    # 4. Load More (the total comes from the first page's count)
+    if filtered_orgs:
+        st.caption(f"Showing {len(filtered_orgs)} of {total_orgs} organizations" if total_orgs is not None
+                   else f"Showing {len(filtered_orgs)} organizations")
+    has_more_orgs = ((len(filtered_orgs) < total_orgs) if total_orgs is not None
+                     else len(filtered_orgs) == st.session_state.directory_pages_loaded * DIRECTORY_PAGE_SIZE)
+    if has_more_orgs:
+        if st.button("Load More Organizations"):
+            st.session_state.directory_pages_loaded += 1
+            st.rerun()
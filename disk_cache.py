@@ -0,0 +1,46 @@
+# disk_cache.py
+
+import hashlib
+import logging
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Parquet files live next to the app so cached query results survive restarts/redeploys
+CACHE_DIR = Path(__file__).parent / ".cache"
+
+def _cache_path(name: str, params: tuple) -> Path:
+    """Returns the file for a query name and its parameters, e.g. ("events", (False,))."""
+    params_hash = hashlib.sha1(repr(params).encode()).hexdigest()[:16]
+    return CACHE_DIR / f"{name}_{params_hash}.parquet"
+
+def load_records(name: str, params: tuple, ttl_seconds: int) -> Optional[List[Dict[str, Any]]]:
+    """Returns cached rows if a file younger than ttl_seconds exists, otherwise None."""
+    path = _cache_path(name, params)
+    try:
+        if time.time() - path.stat().st_mtime < ttl_seconds:
+            import pyarrow.parquet as pq # Imported on first use, so importing this module stays cheap
+            return pq.read_table(path).to_pylist()
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.exception(f"Error reading disk cache {path.name}")
+    return None
+
+def save_records(name: str, params: tuple, records: List[Dict[str, Any]]):
+    """Writes rows to the cache file for this query. Failures are logged and ignored."""
+    path = _cache_path(name, params)
+    try:
+        import pyarrow as pa # Imported on first use, so importing this module stays cheap
+        import pyarrow.parquet as pq
+        CACHE_DIR.mkdir(exist_ok=True)
+        pq.write_table(pa.Table.from_pylist(records), path)
+    except Exception:
+        logger.exception(f"Error writing disk cache {path.name}")
+
+def invalidate(name: str):
+    """Deletes every cached file for a query name, whatever its parameters."""
+    for path in CACHE_DIR.glob(f"{name}_*.parquet"):
+        path.unlink(missing_ok=True)
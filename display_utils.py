@@ -0,0 +1,31 @@
+# display_utils.py
+
+import streamlit as st
+import pandas as pd
+from typing import List, Dict, Any, Union
+
+def display_dataframe_quickly(data: Union[pd.DataFrame, List[Dict[str, Any]]], max_rows: int = 500,
+                              key: str = "table_page", **dataframe_kwargs):
+    """
+    Displays a table with st.dataframe, sending at most max_rows rows to the browser.
+    When the table is larger, a slider picks which page of max_rows rows to show.
+    Accepts either a DataFrame or a list of dicts; extra kwargs go to st.dataframe.
+    """
+    total_rows = len(data)
+
+    if total_rows <= max_rows:
+        st.dataframe(data, **dataframe_kwargs)
+        return
+
+    page_count = -(-total_rows // max_rows)  # ceiling division
+    page = st.slider("Page:", min_value=1, max_value=page_count, value=1, key=key)
+    start_row = (page - 1) * max_rows
+    end_row = min(start_row + max_rows, total_rows)
+
+    if isinstance(data, pd.DataFrame):
+        window = data.iloc[start_row:end_row]
+    else:
+        window = data[start_row:end_row]
+
+    st.dataframe(window, **dataframe_kwargs)
+    st.caption(f"Rows {start_row + 1}–{end_row} of {total_rows} (page {page} of {page_count})")
@@ -1,29 +1,52 @@
 # event_form.py
 
 import streamlit as st
-from database_manager import DatabaseManager
+from database_manager import get_db_manager, get_data_version, bump_data_version
+import disk_cache
 from datetime import datetime, time, timedelta, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
-def get_org_list_for_dropdown():
-    """Fetches a list of all organizations for use in the selection dropdown."""
-    db_manager = DatabaseManager()
-    # Fetches all orgs, ordered by name
-    orgs = db_manager.get_org_directory()
+# How long the form's default date/time stay in session state before being recomputed
+EVENT_DEFAULTS_MAX_AGE = timedelta(hours=1)
+
+@st.cache_data(ttl=600)
+def get_org_list_for_dropdown(orgs_version: int):
+    """
+    Fetches a list of all organizations for use in the selection dropdown.
+    orgs_version is a cache key that changes whenever organizations are edited.
+    """
+    db_manager = get_db_manager()
+    # Fetches only id and name for all orgs, already ordered by name
+    orgs = db_manager.get_org_name_id_pairs()
     
     # Create a dictionary mapping Name -> ID (to easily get the ID from the selected Name)
     org_map = {org['name']: org['id'] for org in orgs}
-    org_names = sorted(list(org_map.keys()))
+    org_names = list(org_map) # Already sorted by the query
     
     return org_names, org_map
 
+def get_event_form_defaults() -> Tuple[Any, time]:
+    """
+    Returns the default date (today) and start time (the next full hour) for the form.
+    They are kept in session state and only recomputed once they are an hour old.
+    """
+    now = datetime.now()
+    defaults = st.session_state.get('event_form_defaults')
+    if defaults is None or now - defaults['computed_at'] > EVENT_DEFAULTS_MAX_AGE:
+        defaults = st.session_state.event_form_defaults = {
+            'computed_at': now,
+            'date': now.date(),
+            'time': (now + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0).time(),
+        }
+    return defaults['date'], defaults['time']
+
 def show_event_creation_form():
     """Displays the form for adding a new event."""
     st.header("➕ Add New Event")
     st.markdown("---")
     
-    org_names, org_map = get_org_list_for_dropdown()
-    db_manager = DatabaseManager()
+    org_names, org_map = get_org_list_for_dropdown(get_data_version("orgs"))
+    db_manager = get_db_manager()
     
     # Check if we have organizations to host the event
     if not org_names:
@@ -43,8 +66,7 @@ def show_event_creation_form():
         col_date, col_start_time, col_end_time = st.columns(3)
         
         # Set default date to today, default time to the next full hour
-        default_date = datetime.today().date()
-        default_time = (datetime.now() + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0).time()
+        default_date, default_time = get_event_form_defaults()
         
         event_date = col_date.date_input("Date *", value=default_date)
         start_time_obj = col_start_time.time_input("Start Time *", value=default_time, step=900) # 15 min increments
@@ -109,11 +131,9 @@ def show_event_creation_form():
             if result:
                 st.success(f"✅ Event '{title}' added successfully!")
                 
-                # Clear the event cache and force a rerun to update the calendar table
-                try:
-                    st.cache_data.clear() 
-                except Exception:
-                    pass
+                # Invalidate only the cached events (in memory and on disk) and rerun to update the calendar table
+                bump_data_version("events")
+                disk_cache.invalidate("events")
                 
                 # After successful submission, switch back to the calendar view
                 st.session_state.show_event_form = False
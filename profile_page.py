@@ -1,17 +1,79 @@
 # profile_page.py (Corrected for harmonized database_manager.py)
 
 import streamlit as st
-from auth_manager import AuthManager
-from database_manager import DatabaseManager
-from typing import Dict, Any, List
+import html
+from auth_manager import get_auth_manager
+from database_manager import get_db_manager
+from typing import Optional
+from functools import lru_cache
+import pandas as pd
+
+# Up to this many memberships are shown as collapsible details; longer lists become one table
+MEMBERSHIP_DETAILS_LIMIT = 5
+
+# Columns of the memberships frame built from get_orgs_for_user's rows
+USER_ORGS_COLUMNS = ['org_id', 'org_name', 'org_category', 'org_description', 'membership_role']
+
+@lru_cache(maxsize=64)
+def format_role(role: Optional[str]) -> str:
+    """Formats a role for display, e.g. 'club_leader' -> 'Club Leader' (memoized; there are only a few roles)."""
+    return (role or 'N/A').replace('_', ' ').title()
+
+def show_memberships_table(user_memberships: pd.DataFrame):
+    """Shows many memberships as a single table."""
+    memberships_df = pd.DataFrame({
+        "Name": user_memberships['org_name'].fillna('Unknown Organization'),
+        "Role": user_memberships['membership_role'].fillna('member').map(format_role),
+        "Category": user_memberships['org_category'].fillna('N/A'),
+        "Description": user_memberships['org_description'].fillna('No description provided.'),
+    })
+    st.dataframe(memberships_df, use_container_width=True, hide_index=True)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def build_membership_details_html(user_memberships: pd.DataFrame) -> str:
+    """
+    Builds every membership's collapsible details block as one HTML string, so the page
+    emits a single element instead of an expander per membership. Cached on the
+    memberships, so unchanged lists reuse the same string. All values are HTML-escaped.
+    """
+    memberships = user_memberships.fillna({'org_name': 'Unknown Organization', 'org_category': 'N/A',
+                                           'org_description': 'No description provided.',
+                                           'membership_role': 'Member'})
+    return "".join(
+        f"<details><summary><strong>{html.escape(str(m.org_name))}</strong> "
+        f"(Your Role: {html.escape(format_role(m.membership_role))})</summary>"
+        f"<p><strong>Category:</strong> {html.escape(str(m.org_category))}</p>"
+        f"<p><strong>Description:</strong> {html.escape(str(m.org_description))}</p>"
+        f"{'' if pd.notna(m.org_id) else '<p><em>Could not retrieve organization details for this membership.</em></p>'}"
+        f"</details>"
+        for m in memberships.itertuples(index=False))
+
+def open_selected_org():
+    """Submit callback for the open-organization form: switches to the selected organization's page."""
+    st.session_state.current_page = "detail"
+    st.session_state.selected_org_id = st.session_state.open_org_id
+
+def show_open_org_form(user_memberships: pd.DataFrame):
+    """One selectbox and submit button for opening any membership's organization page."""
+    # Memberships without an org_id can't be linked to, so they are left out of the selectbox
+    linkable = user_memberships[user_memberships['org_id'].notna()]
+    org_names = dict(zip(linkable['org_id'], linkable['org_name'].fillna('Unknown Organization')))
+    if not org_names:
+        return
+
+    with st.form("open_org_form", border=False):
+        st.selectbox("Open organization page", options=list(org_names),
+                     format_func=org_names.get, key="open_org_id")
+        # The callback switches pages before the submit's rerun, so no extra st.rerun() is needed
+        st.form_submit_button("View Page", on_click=open_selected_org)
 
 def show_profile_page():
     """Displays the current user's profile and memberships."""
     st.title("👤 My Profile")
     st.markdown("---")
 
-    auth = AuthManager()
-    db_manager = DatabaseManager()
+    auth = get_auth_manager() # This session's AuthManager
+    db_manager = get_db_manager() # Shared DatabaseManager
 
     current_user = auth.get_current_user()
 
@@ -23,7 +85,7 @@ def show_profile_page():
     st.subheader("Personal Information")
     st.write(f"**Full Name:** {current_user.get('full_name', 'N/A')}")
     st.write(f"**Email:** {current_user.get('email', 'N/A')}")
-    st.write(f"**Role:** {current_user.get('role', 'N/A').replace('_', ' ').title()}") # Format role nicely
+    st.write(f"**Role:** {format_role(current_user.get('role'))}") # Format role nicely
     st.write(f"**Graduation Year:** {current_user.get('grad_year', 'N/A')}")
     
     st.markdown("---")
@@ -31,38 +93,20 @@ def show_profile_page():
     # --- Display Organization Memberships ---
     st.subheader("My Organization Memberships")
 
-    user_memberships: List[Dict[str, Any]] = db_manager.get_orgs_for_user(current_user['id'])
+    user_memberships = pd.DataFrame.from_records(db_manager.get_orgs_for_user(current_user['id']),
+                                                 columns=USER_ORGS_COLUMNS)
 
-    if not user_memberships:
+    if user_memberships.empty:
         st.info("You are not currently a member of any organization.")
     else:
-        # Use Streamlit's expander for each organization
-        for membership in user_memberships:
-            # Access flattened data directly from the membership dictionary
-            org_id = membership.get('org_id')
-            org_name = membership.get('org_name', 'Unknown Organization')
-            org_category = membership.get('org_category', 'N/A')
-            org_description = membership.get('org_description', 'No description provided.')
-            role_in_org = membership.get('membership_role', 'Member')
-
-            # Ensure a unique key, even if org_id is somehow None (though it shouldn't be with proper data)
-            # We'll use a combination of user_id and org_id for absolute uniqueness
-            unique_key_suffix = f"{current_user['id']}_{org_id}" if org_id else f"{current_user['id']}_{org_name}_{role_in_org}_fallback"
-
-            with st.expander(f"**{org_name}** (Your Role: {role_in_org.title()})"):
-                st.write(f"**Category:** {org_category}")
-                st.write(f"**Description:** {org_description}")
-                
-                # Only show the button if we have a valid org_id to link to
-                if org_id:
-                    if st.button(f"View {org_name} Page", key=f"view_org_page_{unique_key_suffix}"):
-                        st.session_state.current_page = "detail"
-                        st.session_state.selected_org_id = org_id
-                        st.rerun()
-                else:
-                    st.warning("Could not retrieve organization details for this membership.")
+        if len(user_memberships) > MEMBERSHIP_DETAILS_LIMIT:
+            show_memberships_table(user_memberships)
+        else:
+            # One collapsible block per organization, sent as a single markdown element
+            st.markdown(build_membership_details_html(user_memberships), unsafe_allow_html=True)
 
+        show_open_org_form(user_memberships)
 
     # Placeholder for future functionality (e.g., Edit Profile button)
     st.markdown("---")
-    st.button("Edit Profile (Coming Soon)", disabled=True)
\ No newline at end of file
+    st.caption("✏️ *Edit Profile — coming soon*")
\ No newline at end of file
@@ -0,0 +1,23 @@
+-- Indexes for the filters, joins and sort orders used by database_manager.py.
+-- Plain CREATE INDEX is used because migrations run inside a transaction; on a large
+-- live table, run the same statement by hand as CREATE INDEX CONCURRENTLY instead.
+
+-- Trigram support for the directory's name search (.ilike("name", "%query%"))
+create extension if not exists pg_trgm;
+
+-- memberships: roster lookups (.eq("organization_id", ...), embedded memberships on
+-- the detail page) and a user's organizations (.eq("user_id", ...))
+create index if not exists memberships_org_id_idx on public.memberships (organization_id);
+create index if not exists memberships_user_id_idx on public.memberships (user_id);
+
+-- organizations: directory ordering/paging (.order("name").order("id")),
+-- name search, and the category filter / category list
+create index if not exists orgs_name_idx on public.organizations (name, id);
+create index if not exists orgs_name_trgm_idx on public.organizations using gin (name gin_trgm_ops);
+create index if not exists orgs_category_idx on public.organizations (category) where category is not null;
+
+-- users: the admin user list is ordered by full_name
+create index if not exists users_full_name_idx on public.users (full_name);
+
+-- events: the calendar pages through public events ordered by start time, then id
+create index if not exists events_public_start_time_idx on public.events (start_time, id) where is_public;
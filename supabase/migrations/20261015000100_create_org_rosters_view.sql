@@ -0,0 +1,15 @@
+-- Flat roster rows (one per membership, with the member's user details) so the app
+-- receives them ready to display instead of nested users{} objects to reshape.
+-- security_invoker makes the view apply the caller's RLS policies on memberships and users.
+create or replace view public.org_rosters
+with (security_invoker = true) as
+select m.organization_id,
+       m.user_id,
+       m.role as membership_role,
+       u.full_name,
+       u.email,
+       u.grad_year
+from public.memberships m
+join public.users u on u.id = m.user_id;
+
+grant select on public.org_rosters to anon, authenticated;
@@ -0,0 +1,5 @@
+-- Short description for the directory cards, so the directory can skip the full text.
+-- 101 characters: the 100 the card shows, plus one to tell whether it was cut off.
+alter table public.organizations
+    add column if not exists description_snippet text
+    generated always as (left(description, 101)) stored;
@@ -0,0 +1,10 @@
+-- Distinct organization categories for the directory's category filter, so the app
+-- receives one row per category instead of one per organization.
+-- security_invoker makes the view apply the caller's RLS policies on organizations.
+create or replace view public.org_categories
+with (security_invoker = true) as
+select distinct category
+from public.organizations
+where category is not null;
+
+grant select on public.org_categories to anon, authenticated;
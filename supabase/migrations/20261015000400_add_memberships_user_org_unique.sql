@@ -0,0 +1,8 @@
+-- One membership per (user, organization). join_organization relies on this constraint:
+-- its upsert uses on_conflict=user_id,organization_id, which PostgREST rejects (42P10)
+-- unless a matching unique constraint exists.
+alter table public.memberships
+    add constraint memberships_user_org_key unique (user_id, organization_id);
+
+-- The constraint's index leads with user_id, so it already serves .eq("user_id", ...)
+drop index if exists public.memberships_user_id_idx;